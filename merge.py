@@ -1,20 +1,512 @@
 import sys
 import os
 import re
+import io
+import time
+import itertools
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, QLabel, 
                             QVBoxLayout, QHBoxLayout, QFileDialog, QListWidget, 
                             QWidget, QProgressBar, QMessageBox, QAbstractItemView,
-                            QDialog, QScrollArea, QGroupBox, QLineEdit, QGridLayout)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+                            QDialog, QLineEdit, QListView, QStyledItemDelegate)
+from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QAbstractListModel, QModelIndex,
+                          QObject, QRunnable, QThreadPool, QSize)
+from PyQt5.QtGui import QImage, QPixmap, QIcon
 from PyPDF2 import PdfReader, PdfWriter
 
+try:
+    # Optional, for page thumbnails in the preview: pip install PyMuPDF
+    import pymupdf as fitz
+except ImportError:
+    try:
+        # PyMuPDF releases before 1.24.3 only provide the fitz name
+        import fitz
+    except ImportError:
+        fitz = None
+
+try:
+    # Optional, faster merge backend built on libqpdf: pip install pikepdf
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+
+# First run of digits in a filename, used as the numeric sort key
+_LEADING_NUM_RE = re.compile(r'\d+')
+
+# Turns a page bitmap of 0/1 bytes into its complement
+_FLIP_BITMAP = bytes.maketrans(b'\x00\x01', b'\x01\x00')
+
+# Tokens needed to find /Root -> /Pages -> /Count without a full PdfReader
+_STARTXREF_RE = re.compile(rb'startxref\s+(\d+)')
+_OBJ_HEADER_RE = re.compile(rb'\s*(\d+)\s+\d+\s+obj\b')
+_ROOT_REF_RE = re.compile(rb'/Root\s+(\d+)\s+\d+\s+R')
+_PREV_RE = re.compile(rb'/Prev\s+(\d+)')
+_PAGES_REF_RE = re.compile(rb'/Pages\s+(\d+)\s+\d+\s+R')
+_COUNT_RE = re.compile(rb'/Count\s+(\d+)(?!\d|\s+\d+\s+R)')
+
+
+def parse_page_selection(selection_str, total_pages):
+    """
+    Parse a page selection string and return a list of page indices (0-based)
+    
+    Format:
+    - Blank or 'all': All pages
+    - '1,3,5-7': Include pages 1, 3, and 5 through 7
+    - '-1,-3': Exclude pages 1 and 3
+    - '-1-3': Exclude pages 1 through 3
+    """
+    # If empty or "all", include all pages
+    if not selection_str or selection_str.lower() == "all":
+        return list(range(total_pages))
+    
+    # One byte per page (1 = selected) instead of sets of ints
+    pages_to_include = bytearray(total_pages)
+    pages_to_exclude = bytearray(total_pages)
+    has_include = False
+    
+    # Parse each part of the selection (comma-separated)
+    for part in selection_str.split(','):
+        part = part.strip()
+        if not part:
+            continue
+            
+        # Check if it's an exclusion
+        is_exclude = part.startswith('-')
+        if is_exclude:
+            part = part[1:]  # Remove the '-'
+        
+        # Check if it's a range (contains a hyphen)
+        if '-' in part:
+            start, end = part.split('-', 1)
+            try:
+                # Convert to 0-based indices
+                start_idx = int(start) - 1 if start else 0
+                end_idx = int(end) - 1 if end else total_pages - 1
+            except ValueError:
+                # Invalid range, ignore
+                continue
+            
+            # Ensure valid page range
+            start_idx = max(0, start_idx)
+            end_idx = min(total_pages - 1, end_idx)
+            if start_idx > end_idx:
+                continue
+            
+            page_range = b'\x01' * (end_idx - start_idx + 1)
+            if is_exclude:
+                pages_to_exclude[start_idx:end_idx + 1] = page_range
+            else:
+                pages_to_include[start_idx:end_idx + 1] = page_range
+                has_include = True
+        else:
+            # Single page
+            try:
+                # Convert to 0-based index
+                page_idx = int(part) - 1
+            except ValueError:
+                # Invalid page, ignore
+                continue
+            
+            # Ensure valid page
+            if 0 <= page_idx < total_pages:
+                if is_exclude:
+                    pages_to_exclude[page_idx] = 1
+                else:
+                    pages_to_include[page_idx] = 1
+                    has_include = True
+    
+    # If specific includes were given, keep those that aren't excluded;
+    # otherwise start with all pages and drop the excluded ones
+    mask = pages_to_exclude.translate(_FLIP_BITMAP)
+    if has_include:
+        # Bytewise AND of the two bitmaps, done on them as big integers
+        mask = (int.from_bytes(pages_to_include, 'little') &
+                int.from_bytes(mask, 'little')).to_bytes(total_pages, 'little')
+    return list(itertools.compress(range(total_pages), mask))
+
+
+try:
+    # Compiled parser from merge_core.pyx, built with: python setup.py build_ext --inplace
+    from merge_core import parse_page_selection
+except ImportError:
+    pass
+
+
+# Total size of the files whose readers get_cached_reader keeps. A reader
+# holds the whole file plus every object a merge resolved from it
+READER_CACHE_MAX_BYTES = 64 << 20
+
+
+def get_cached_reader(reader_cache, pdf_file):
+    """
+    Return a PdfReader for pdf_file, reusing the one in reader_cache if the
+    file hasn't been modified since it was opened
+    
+    reader_cache maps path -> (mtime, size, PdfReader). The main window keeps
+    it across merges so merging the same files again skips parsing, and the
+    merge thread is the only one that reads from it. Least recently used
+    readers are dropped once the cached files exceed READER_CACHE_MAX_BYTES.
+    """
+    stat = os.stat(pdf_file)
+    cached = reader_cache.pop(pdf_file, None)
+    if cached is not None and cached[0] == stat.st_mtime:
+        pdf_reader = cached[2]
+    else:
+        pdf_reader = PdfReader(pdf_file)
+    
+    # Re-insert so dict order runs from least to most recently used
+    reader_cache[pdf_file] = (stat.st_mtime, stat.st_size, pdf_reader)
+    total_size = sum(size for _, size, _ in reader_cache.values())
+    while total_size > READER_CACHE_MAX_BYTES and len(reader_cache) > 1:
+        oldest = next(iter(reader_cache))
+        total_size -= reader_cache.pop(oldest)[1]
+    return pdf_reader
+
+
+def open_pikepdf(pdf_file):
+    """
+    Open pdf_file with pikepdf from an in-memory copy
+    
+    Sources have to stay open until the merged PDF is saved; reading them
+    into memory keeps large batches from running out of file descriptors.
+    """
+    with open(pdf_file, 'rb') as pdf_stream:
+        return pikepdf.Pdf.open(io.BytesIO(pdf_stream.read()))
+
+
+def _read_xref_section(pdf_stream):
+    """Read a classic cross-reference table, returning (offsets, trailer bytes)"""
+    if pdf_stream.readline().strip() != b'xref':
+        raise ValueError("Not a cross-reference table")
+    
+    offsets = {}  # object number -> byte offset, or None for free objects
+    while True:
+        line = pdf_stream.readline()
+        if not line:
+            raise ValueError("Truncated cross-reference table")
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith(b'trailer'):
+            break
+        
+        # Subsection header "first count", followed by 20-byte entries
+        first, count = map(int, line.split())
+        for obj_num in range(first, first + count):
+            entry = pdf_stream.read(20)
+            # Keep free entries too, so they hide offsets from older sections
+            offsets[obj_num] = int(entry[:10]) if entry[17:18] == b'n' else None
+    
+    trailer = line + pdf_stream.read(4096)
+    return offsets, trailer.split(b'startxref', 1)[0]
+
+
+def _read_object(pdf_stream, obj_num, offset, max_size=1 << 20):
+    """Return the raw bytes of an uncompressed indirect object"""
+    if offset is None:
+        raise ValueError(f"Object {obj_num} is free")
+    pdf_stream.seek(offset)
+    data = pdf_stream.read(4096)
+    header = _OBJ_HEADER_RE.match(data)
+    if not header or int(header.group(1)) != obj_num:
+        raise ValueError(f"Object {obj_num} not found at offset {offset}")
+    
+    # Large /Kids arrays can make the object longer than one read
+    while b'endobj' not in data and len(data) < max_size:
+        chunk = pdf_stream.read(65536)
+        if not chunk:
+            break
+        data += chunk
+    return data.split(b'endobj', 1)[0]
+
+
+def _trailer_page_count(pdf_file):
+    """
+    Read /Root -> /Pages -> /Count straight from pdf_file
+    
+    Reads only the trailer, the cross-reference table and the catalog and
+    page tree root objects, instead of building a PdfReader that resolves
+    the whole page tree. Raises for files this can't handle (cross-reference
+    streams, objects in object streams, an indirect /Count).
+    """
+    with open(pdf_file, 'rb') as pdf_stream:
+        pdf_stream.seek(0, os.SEEK_END)
+        pdf_stream.seek(max(0, pdf_stream.tell() - 1024))
+        xref_offset = int(_STARTXREF_RE.findall(pdf_stream.read())[-1])
+        
+        # Walk the table and any incremental updates, newest first
+        offsets = {}
+        root = None
+        seen = set()
+        while xref_offset is not None and xref_offset not in seen:
+            seen.add(xref_offset)
+            pdf_stream.seek(xref_offset)
+            section, trailer = _read_xref_section(pdf_stream)
+            for obj_num, offset in section.items():
+                offsets.setdefault(obj_num, offset)
+            
+            if root is None:
+                match = _ROOT_REF_RE.search(trailer)
+                root = int(match.group(1)) if match else None
+            prev = _PREV_RE.search(trailer)
+            xref_offset = int(prev.group(1)) if prev else None
+        
+        catalog = _read_object(pdf_stream, root, offsets[root])
+        pages = int(_PAGES_REF_RE.search(catalog).group(1))
+        page_tree = _read_object(pdf_stream, pages, offsets[pages])
+        return int(_COUNT_RE.search(page_tree).group(1))
+
+
+def _fast_page_count(pdf_file):
+    """Return the number of pages in pdf_file, only using PdfReader if _trailer_page_count can't"""
+    try:
+        return _trailer_page_count(pdf_file)
+    except Exception:
+        pass
+    
+    pdf_reader = PdfReader(pdf_file)
+    return len(pdf_reader.pages)
+
+
+class ProgressPdfWriter(PdfWriter):
+    """
+    PdfWriter that calls page_added() after each page it copies
+    
+    append() adds every page through add_page, so this reports progress
+    within a single append() call. Appending a file in several calls instead
+    would drop links and outline items that point into another call's pages.
+    """
+    def __init__(self, page_added):
+        super().__init__()
+        self.page_added = page_added
+    
+    def add_page(self, *args, **kwargs):
+        page = super().add_page(*args, **kwargs)
+        self.page_added()
+        return page
+
+
+class PageCountSignals(QObject):
+    """Signals for PageCountTask, which as a QRunnable can't define its own"""
+    finished = pyqtSignal(str, object)  # path, page count or error message
+
+
+class PageCountTask(QRunnable):
+    """Reads a PDF's page count on a QThreadPool thread"""
+    def __init__(self, pdf_file):
+        super().__init__()
+        self.pdf_file = pdf_file
+        self.signals = PageCountSignals()
+        
+    def run(self):
+        try:
+            result = _fast_page_count(self.pdf_file)
+        except Exception as e:
+            result = f"Error reading PDF: {str(e)}"
+        self.signals.finished.emit(self.pdf_file, result)
+
+
+class PdfFileListModel(QAbstractListModel):
+    """
+    List model behind the page selection dialog
+    
+    Page counts are only read when a row is first displayed, and then in the
+    background, so opening the dialog never waits on PDF parsing.
+    """
+    PageCountRole = Qt.UserRole
+    
+    def __init__(self, pdf_files, page_selections, parent=None):
+        super().__init__(parent)
+        self.pdf_files = pdf_files
+        self.page_selections = page_selections  # path -> selection string
+        self.rows = {pdf_file: row for row, pdf_file in enumerate(pdf_files)}
+        self.page_counts = {}  # path -> page count, or an error message
+        self.pending_tasks = {}  # path -> PageCountTask still running
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.pdf_files)
+    
+    def page_count(self, pdf_file):
+        """Return the cached page count, or None after starting a background read"""
+        if pdf_file in self.page_counts:
+            return self.page_counts[pdf_file]
+        
+        if pdf_file not in self.pending_tasks:
+            task = PageCountTask(pdf_file)
+            task.signals.finished.connect(self.page_count_ready)
+            self.pending_tasks[pdf_file] = task
+            QThreadPool.globalInstance().start(task)
+        return None
+    
+    def page_count_ready(self, pdf_file, result):
+        self.pending_tasks.pop(pdf_file, None)
+        self.page_counts[pdf_file] = result
+        
+        index = self.index(self.rows[pdf_file])
+        self.dataChanged.emit(index, index)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        pdf_file = self.pdf_files[index.row()]
+        if role == Qt.DisplayRole:
+            total_pages = self.page_count(pdf_file)
+            if total_pages is None:
+                info = "Total pages: ..."
+            elif isinstance(total_pages, int):
+                info = f"Total pages: {total_pages}"
+            else:
+                info = total_pages
+            return (f"{os.path.basename(pdf_file)}\n"
+                    f"{info}    Pages to include/exclude: {self.page_selections[pdf_file]}")
+        if role == Qt.EditRole:
+            return self.page_selections[pdf_file]
+        if role == Qt.ToolTipRole:
+            return pdf_file
+        if role == self.PageCountRole:
+            return self.page_count(pdf_file)
+        return None
+    
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        
+        self.page_selections[self.pdf_files[index.row()]] = value
+        self.dataChanged.emit(index, index)
+        return True
+    
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+    
+    def set_all_selections(self, selection_str):
+        """Use the same page selection for every file"""
+        for pdf_file in self.pdf_files:
+            self.page_selections[pdf_file] = selection_str
+        if self.pdf_files:
+            self.dataChanged.emit(self.index(0), self.index(len(self.pdf_files) - 1))
+
+
+class PageSelectionDelegate(QStyledItemDelegate):
+    """Creates a QLineEdit for a file's page selection only while that row is being edited"""
+    def createEditor(self, parent, option, index):
+        return QLineEdit(parent)
+    
+    def setEditorData(self, editor, index):
+        editor.setText(index.data(Qt.EditRole))
+    
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.text(), Qt.EditRole)
+    
+    def updateEditorGeometry(self, editor, option, index):
+        # Cover the second line of the row so the filename stays visible
+        rect = option.rect
+        rect.setTop(rect.center().y())
+        editor.setGeometry(rect)
+
+
+class ThumbnailSignals(QObject):
+    """Signals for ThumbnailTask, which as a QRunnable can't define its own"""
+    finished = pyqtSignal(int, object)  # page index, QImage or None on error
+
+
+class ThumbnailTask(QRunnable):
+    """Renders one page thumbnail with PyMuPDF on PreviewPageModel's thumbnail pool"""
+    # Thumbnail scale relative to the page size at 72 dpi
+    ZOOM = 0.25
+    
+    def __init__(self, pdf_file, page_idx):
+        super().__init__()
+        self.pdf_file = pdf_file
+        self.page_idx = page_idx
+        self.signals = ThumbnailSignals()
+        # PreviewPageModel keeps the task until its result arrives, so the
+        # pool must not delete it after run()
+        self.setAutoDelete(False)
+        
+    def run(self):
+        try:
+            with fitz.open(self.pdf_file) as doc:
+                pix = doc[self.page_idx].get_pixmap(matrix=fitz.Matrix(self.ZOOM, self.ZOOM),
+                                                    alpha=False)
+                image = QImage(pix.samples, pix.width, pix.height, pix.stride,
+                               QImage.Format_RGB888).copy()  # Detach from pix.samples
+        except Exception:
+            image = None
+        # QPixmap may only be created on the GUI thread, so send the QImage
+        self.signals.finished.emit(self.page_idx, image)
+
+
+class PreviewPageModel(QAbstractListModel):
+    """
+    One cell per page for the preview grid
+    
+    Thumbnails are rendered only when a cell is first displayed, in the
+    background; without PyMuPDF the cells just show the page numbers.
+    """
+    # PyMuPDF doesn't support being used from several threads at once, even
+    # with separate documents, so every thumbnail renders on this one thread
+    thumbnail_pool = None
+    
+    def __init__(self, pdf_file, total_pages, parent=None):
+        super().__init__(parent)
+        if PreviewPageModel.thumbnail_pool is None:
+            PreviewPageModel.thumbnail_pool = QThreadPool()
+            PreviewPageModel.thumbnail_pool.setMaxThreadCount(1)
+        self.pdf_file = pdf_file
+        self.total_pages = total_pages
+        self.thumbnails = {}  # page index -> QIcon, or None if rendering failed
+        self.pending_tasks = {}  # page index -> ThumbnailTask whose result hasn't arrived yet
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.total_pages
+        
+    def thumbnail(self, page_idx):
+        """Return the cached thumbnail, or None after starting a background render"""
+        if page_idx in self.thumbnails:
+            return self.thumbnails[page_idx]
+            
+        if fitz is not None and page_idx not in self.pending_tasks:
+            task = ThumbnailTask(self.pdf_file, page_idx)
+            task.signals.finished.connect(self.thumbnail_ready)
+            self.pending_tasks[page_idx] = task
+            self.thumbnail_pool.start(task)
+        return None
+        
+    def thumbnail_ready(self, page_idx, image):
+        self.pending_tasks.pop(page_idx, None)
+        self.thumbnails[page_idx] = QIcon(QPixmap.fromImage(image)) if image is not None else None
+        
+        index = self.index(page_idx)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+        
+    def cancel_pending(self):
+        """Drop renders that haven't started yet, e.g. when the preview closes"""
+        for page_idx, task in list(self.pending_tasks.items()):
+            # Running or finished tasks stay referenced until thumbnail_ready
+            if self.thumbnail_pool.tryTake(task):
+                del self.pending_tasks[page_idx]
+        
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+            
+        if role == Qt.DisplayRole:
+            return f"Page {index.row() + 1}"
+        if role == Qt.DecorationRole:
+            return self.thumbnail(index.row())
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        return None
+
 
 class PdfPageSelectionDialog(QDialog):
     """Dialog for selecting which pages to include/exclude from each PDF"""
     def __init__(self, pdf_files, parent=None):
         super().__init__(parent)
         self.pdf_files = pdf_files
-        self.page_selections = {}  # Dictionary to store selections for each file
+        # Dictionary to store selections for each file (default: exclude first page)
+        self.page_selections = {pdf_file: "-1" for pdf_file in pdf_files}
         self.init_ui()
         
     def init_ui(self):
@@ -49,18 +541,32 @@ class PdfPageSelectionDialog(QDialog):
         default_layout.addWidget(self.apply_default_button)
         layout.addLayout(default_layout)
         
-        # Scrollable area for file list
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_content = QWidget()
-        self.scroll_layout = QVBoxLayout(scroll_content)
-        
-        # Add each file
-        for pdf_file in self.pdf_files:
-            self.add_file_entry(pdf_file)
-            
-        scroll_area.setWidget(scroll_content)
-        layout.addWidget(scroll_area, 1)
+        # File list; rows are painted on demand and the selection editor is
+        # created only for the row being edited
+        self.file_model = PdfFileListModel(self.pdf_files, self.page_selections, self)
+        self.file_view = QListView()
+        self.file_view.setModel(self.file_model)
+        self.file_view.setItemDelegate(PageSelectionDelegate(self.file_view))
+        self.file_view.setUniformItemSizes(True)
+        self.file_view.setEditTriggers(QAbstractItemView.DoubleClicked |
+                                       QAbstractItemView.SelectedClicked |
+                                       QAbstractItemView.EditKeyPressed)
+        layout.addWidget(self.file_view, 1)
+        
+        edit_hint = QLabel("Double-click a file to edit its page selection.")
+        self.preview_button = QPushButton("Preview Pages")
+        self.preview_button.clicked.connect(self.preview_current)
+        
+        # Preview needs the page count, which is read in the background
+        self.preview_button.setEnabled(False)
+        self.file_view.selectionModel().currentChanged.connect(self.update_preview_button)
+        self.file_model.dataChanged.connect(self.update_preview_button)
+        
+        preview_layout = QHBoxLayout()
+        preview_layout.addWidget(edit_hint)
+        preview_layout.addStretch()
+        preview_layout.addWidget(self.preview_button)
+        layout.addLayout(preview_layout)
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -73,50 +579,23 @@ class PdfPageSelectionDialog(QDialog):
         button_layout.addWidget(self.ok_button)
         layout.addLayout(button_layout)
         
-    def add_file_entry(self, pdf_file):
-        filename = os.path.basename(pdf_file)
-        
-        # Create a group for this file
-        file_group = QGroupBox(filename)
-        file_layout = QVBoxLayout(file_group)
-        
-        # Get total pages
-        try:
-            pdf_reader = PdfReader(pdf_file)
-            total_pages = len(pdf_reader.pages)
-            
-            info_layout = QHBoxLayout()
-            info_label = QLabel(f"Total pages: {total_pages}")
-            preview_button = QPushButton("Preview Pages")
-            preview_button.clicked.connect(lambda checked, f=pdf_file: self.preview_pages(f))
-            
-            info_layout.addWidget(info_label)
-            info_layout.addWidget(preview_button)
-            info_layout.addStretch()
-            
-            file_layout.addLayout(info_layout)
-            
-            # Page selection input
-            selection_layout = QHBoxLayout()
-            selection_label = QLabel("Pages to include/exclude:")
-            selection_input = QLineEdit("-1")  # Default to excluding first page
-            
-            selection_layout.addWidget(selection_label)
-            selection_layout.addWidget(selection_input, 1)
-            
-            file_layout.addLayout(selection_layout)
-            
-            # Store the input field reference
-            self.page_selections[pdf_file] = selection_input
-            
-        except Exception as e:
-            error_label = QLabel(f"Error reading PDF: {str(e)}")
-            file_layout.addWidget(error_label)
-        
-        self.scroll_layout.addWidget(file_group)
+    def update_preview_button(self, *args):
+        """Only enable Preview once the current row's page count has been read"""
+        index = self.file_view.currentIndex()
+        self.preview_button.setEnabled(
+            index.isValid() and isinstance(index.data(PdfFileListModel.PageCountRole), int))
     
-    def preview_pages(self, pdf_file):
-        """Show a preview dialog with thumbnails of each page"""
+    def preview_current(self):
+        """Preview the file in the currently selected row"""
+        index = self.file_view.currentIndex()
+        if not index.isValid():
+            return
+        total_pages = index.data(PdfFileListModel.PageCountRole)
+        if isinstance(total_pages, int):
+            self.preview_pages(self.pdf_files[index.row()], total_pages)
+    
+    def preview_pages(self, pdf_file, total_pages):
+        """Show a preview dialog with thumbnails of each page, given its already read page count"""
         try:
             preview_dialog = QDialog(self)
             preview_dialog.setWindowTitle(f"Preview: {os.path.basename(pdf_file)}")
@@ -125,37 +604,33 @@ class PdfPageSelectionDialog(QDialog):
             
             layout = QVBoxLayout(preview_dialog)
             
-            # Add a scrollable area for thumbnails
-            scroll = QScrollArea()
-            scroll.setWidgetResizable(True)
-            scroll_content = QWidget()
-            thumbnail_layout = QGridLayout(scroll_content)
-            
-            # Load the PDF
-            pdf_reader = PdfReader(pdf_file)
-            total_pages = len(pdf_reader.pages)
-            
-            # Simple message - can be enhanced with actual thumbnails in a production app
-            message = QLabel(f"This PDF contains {total_pages} pages.\n\n"
-                             f"In a full implementation, this dialog would show actual thumbnails of each page.\n"
-                             f"For now, please use the page numbers to make your selection.")
+            if fitz is not None:
+                message = QLabel(f"This PDF contains {total_pages} pages.")
+            else:
+                message = QLabel(f"This PDF contains {total_pages} pages.\n\n"
+                                 f"Install PyMuPDF to see thumbnails of each page.\n"
+                                 f"For now, please use the page numbers to make your selection.")
             message.setWordWrap(True)
             message.setAlignment(Qt.AlignCenter)
+            layout.addWidget(message)
             
-            thumbnail_layout.addWidget(message, 0, 0, 1, 4)
+            # Page cells in a wrapping grid; the view only asks the model for
+            # the visible cells, so only those get a thumbnail rendered
+            model = PreviewPageModel(pdf_file, total_pages, preview_dialog)
             
-            # Add page number labels in a grid (4 columns)
-            for i in range(total_pages):
-                page_label = QLabel(f"Page {i+1}")
-                page_label.setAlignment(Qt.AlignCenter)
-                page_label.setStyleSheet("border: 1px solid gray; padding: 8px; margin: 2px;")
-                
-                row = (i // 4) + 1  # +1 because row 0 has the message
-                col = i % 4
-                thumbnail_layout.addWidget(page_label, row, col)
-            
-            scroll.setWidget(scroll_content)
-            layout.addWidget(scroll)
+            view = QListView()
+            view.setModel(model)
+            view.setViewMode(QListView.IconMode)
+            view.setMovement(QListView.Static)
+            view.setResizeMode(QListView.Adjust)
+            view.setUniformItemSizes(True)
+            view.setSpacing(2)
+            if fitz is not None:
+                # Fixed cell size, so cells don't grow as thumbnails arrive
+                view.setIconSize(QSize(150, 200))
+                view.setGridSize(QSize(170, 240))
+            view.setStyleSheet("QListView::item { border: 1px solid gray; padding: 8px; }")
+            layout.addWidget(view, 1)
             
             # Close button
             close_button = QPushButton("Close")
@@ -163,22 +638,18 @@ class PdfPageSelectionDialog(QDialog):
             layout.addWidget(close_button)
             
             preview_dialog.exec_()
+            model.cancel_pending()
             
         except Exception as e:
             QMessageBox.warning(self, "Preview Error", f"Could not preview PDF: {str(e)}")
     
     def apply_default_to_all(self):
         """Apply the default page selection to all files"""
-        default_value = self.default_input.text()
-        for input_field in self.page_selections.values():
-            input_field.setText(default_value)
+        self.file_model.set_all_selections(self.default_input.text())
     
     def get_selections(self):
         """Return the page selection for each file"""
-        selections = {}
-        for pdf_file, input_field in self.page_selections.items():
-            selections[pdf_file] = input_field.text()
-        return selections
+        return dict(self.page_selections)
 
 
 class PdfMergerThread(QThread):
@@ -186,144 +657,155 @@ class PdfMergerThread(QThread):
     update_progress = pyqtSignal(int)
     finished_signal = pyqtSignal(bool, str)
     
-    def __init__(self, pdf_files, output_file, page_selections=None):
+    # Minimum time between progress signals, in seconds
+    PROGRESS_INTERVAL = 0.05
+    # Pages pikepdf copies between progress updates
+    PIKEPDF_CHUNK_PAGES = 64
+    # PdfWriter.write issues many small writes; buffer them into larger chunks
+    OUTPUT_BUFFER_SIZE = 1 << 20
+    
+    def __init__(self, pdf_files, output_file, page_selections=None, reader_cache=None):
         super().__init__()
         # Make a deep copy of the pdf_files list to prevent any issues with the main thread
         self.pdf_files = pdf_files.copy()
         self.output_file = output_file
         self.page_selections = page_selections or {}  # Dictionary of page selections
+        self.reader_cache = reader_cache if reader_cache is not None else {}
         
         # Log the file order for debugging
-        file_order = [os.path.basename(f) for f in self.pdf_files]
-        print(f"Merging PDFs in order: {file_order}")
+        self.file_names = [os.path.basename(f) for f in self.pdf_files]
+        print(f"Merging PDFs in order: {self.file_names}")
         
     def run(self):
         try:
-            # Create PDF writer
-            pdf_writer = PdfWriter()
-            
-            # Process each PDF file
-            for i, pdf_file in enumerate(self.pdf_files):
-                # Update progress
-                progress = int((i / len(self.pdf_files)) * 100)
-                self.update_progress.emit(progress)
-                
-                try:
-                    # Create PDF reader
-                    pdf_reader = PdfReader(pdf_file)
-                    total_pages = len(pdf_reader.pages)
-                    
-                    # Get page selection for this file (default: exclude first page)
-                    selection_str = self.page_selections.get(pdf_file, "-1")
-                    
-                    # Parse the page selection string
-                    pages_to_include = self.parse_page_selection(selection_str, total_pages)
-                    
-                    # Add the selected pages
-                    for page_num in pages_to_include:
-                        pdf_writer.add_page(pdf_reader.pages[page_num])
-                    
-                except Exception as e:
-                    self.finished_signal.emit(False, f"Error processing {os.path.basename(pdf_file)}: {str(e)}")
-                    return
+            tasks = [(i, pdf_file, self.page_selections.get(pdf_file, "-1"))
+                     for i, pdf_file in enumerate(self.pdf_files)]
             
-            # Write the merged PDF
-            if len(pdf_writer.pages) > 0:
-                with open(self.output_file, 'wb') as out_file:
-                    pdf_writer.write(out_file)
-                self.update_progress.emit(100)
-                self.finished_signal.emit(True, f"Successfully merged {len(self.pdf_files)} PDFs into {self.output_file}")
+            # Progress counts copied pages out of all selected pages
+            self.pages_copied = 0
+            self.last_progress = -1
+            self.last_emit = float('-inf')
+            
+            if pikepdf is not None:
+                self.merge_with_pikepdf(tasks)
             else:
-                self.finished_signal.emit(False, "No pages to merge after applying page selections")
+                # PyPDF2 copies pages in Python; a worker pool would only add
+                # another parse and write of every page to combine the parts
+                self.merge_with_cached_readers(tasks)
         except Exception as e:
             self.finished_signal.emit(False, f"Error during merge: {str(e)}")
     
-    def parse_page_selection(self, selection_str, total_pages):
+    def merge_with_pikepdf(self, tasks):
         """
-        Parse a page selection string and return a list of page indices (0-based)
+        Merge with pikepdf instead of PyPDF2
         
-        Format:
-        - Blank or 'all': All pages
-        - '1,3,5-7': Include pages 1, 3, and 5 through 7
-        - '-1,-3': Exclude pages 1 and 3
-        - '-1-3': Exclude pages 1 through 3
+        qpdf copies pages and the objects they share natively, instead of
+        building Python objects for each of them.
         """
-        # If empty or "all", include all pages
-        if not selection_str or selection_str.lower() == "all":
-            return list(range(total_pages))
-        
-        # Start with all pages
-        all_pages = set(range(total_pages))
-        pages_to_include = set()
-        pages_to_exclude = set()
-        
-        # Parse each part of the selection (comma-separated)
-        for part in selection_str.split(','):
-            part = part.strip()
-            if not part:
-                continue
-                
-            # Check if it's an exclusion
-            is_exclude = part.startswith('-')
-            if is_exclude:
-                part = part[1:]  # Remove the '-'
+        selected = []  # Source PDFs must stay open until the output is saved
+        try:
+            if not self.open_selected(tasks, open_pikepdf, selected):
+                return
+            total = sum(len(pages_to_include) for _, _, pages_to_include in selected)
+            if not total:
+                self.finished_signal.emit(False, "No pages to merge after applying page selections")
+                return
             
-            # Check if it's a range (contains a hyphen)
-            if '-' in part:
-                start, end = part.split('-', 1)
+            out_pdf = pikepdf.Pdf.new()
+            for index, src_pdf, pages_to_include in selected:
                 try:
-                    # Convert to 0-based indices
-                    start_idx = int(start) - 1 if start else 0
-                    end_idx = int(end) - 1 if end else total_pages - 1
-                    
-                    # Ensure valid page range
-                    start_idx = max(0, start_idx)
-                    end_idx = min(total_pages - 1, end_idx)
-                    
-                    page_range = set(range(start_idx, end_idx + 1))
-                    
-                    if is_exclude:
-                        pages_to_exclude.update(page_range)
-                    else:
-                        pages_to_include.update(page_range)
-                except ValueError:
-                    # Invalid range, ignore
-                    continue
-            else:
-                # Single page
-                try:
-                    # Convert to 0-based index
-                    page_idx = int(part) - 1
-                    
-                    # Ensure valid page
-                    if 0 <= page_idx < total_pages:
-                        if is_exclude:
-                            pages_to_exclude.add(page_idx)
-                        else:
-                            pages_to_include.add(page_idx)
-                except ValueError:
-                    # Invalid page, ignore
-                    continue
-        
-        # If specific includes were given, start with those
-        if pages_to_include:
-            result = pages_to_include
-        else:
-            # Otherwise, start with all pages
-            result = all_pages
+                    # Copy in chunks so large files still move the progress bar
+                    for start in range(0, len(pages_to_include), self.PIKEPDF_CHUNK_PAGES):
+                        chunk = pages_to_include[start:start + self.PIKEPDF_CHUNK_PAGES]
+                        out_pdf.pages.extend(src_pdf.pages[i] for i in chunk)
+                        self.pages_copied += len(chunk)
+                        self.report_progress(self.pages_copied, total)
+                except Exception as e:
+                    self.finished_signal.emit(False, f"Error processing {self.file_names[index]}: {str(e)}")
+                    return
+            
+            # Write the merged PDF
+            with open(self.output_file, 'wb', buffering=self.OUTPUT_BUFFER_SIZE) as out_file:
+                out_pdf.save(out_file, linearize=False,
+                             object_stream_mode=pikepdf.ObjectStreamMode.generate)
+            self.update_progress.emit(100)
+            self.finished_signal.emit(True, f"Successfully merged {len(self.pdf_files)} PDFs into {self.output_file}")
+        finally:
+            for _, src_pdf, _ in selected:
+                src_pdf.close()
+    
+    def merge_with_cached_readers(self, tasks):
+        """
+        Merge with PyPDF2, using the shared reader cache
+        
+        Each file's selected pages are appended straight into one PdfWriter,
+        so nothing is written to an in-memory PDF and parsed again.
+        """
+        selected = []
+        if not self.open_selected(tasks, lambda pdf_file: get_cached_reader(self.reader_cache, pdf_file),
+                                  selected):
+            return
+        total = sum(len(pages_to_include) for _, _, pages_to_include in selected)
+        if not total:
+            self.finished_signal.emit(False, "No pages to merge after applying page selections")
+            return
         
-        # Remove excluded pages
-        result -= pages_to_exclude
+        def page_added():
+            self.pages_copied += 1
+            self.report_progress(self.pages_copied, total)
+        
+        pdf_writer = ProgressPdfWriter(page_added)
+        for index, pdf_reader, pages_to_include in selected:
+            if not pages_to_include:
+                continue
+            try:
+                # One call per file so shared resources are cloned once
+                pdf_writer.append(fileobj=pdf_reader, pages=pages_to_include)
+            except Exception as e:
+                self.finished_signal.emit(False, f"Error processing {self.file_names[index]}: {str(e)}")
+                return
+        
+        # Write the merged PDF
+        with open(self.output_file, 'wb', buffering=self.OUTPUT_BUFFER_SIZE) as out_file:
+            pdf_writer.write(out_file)
+        self.update_progress.emit(100)
+        self.finished_signal.emit(True, f"Successfully merged {len(self.pdf_files)} PDFs into {self.output_file}")
+    
+    def open_selected(self, tasks, open_pdf, selected):
+        """
+        Open each file with open_pdf and resolve its page selection
         
-        # Sort and return as a list
-        return sorted(result)
+        Appends (index, pdf, pages_to_include) to selected for each file, so
+        the total page count is known before any page is copied. Returns
+        False after reporting the first file that can't be opened.
+        """
+        for index, pdf_file, selection_str in tasks:
+            try:
+                pdf = open_pdf(pdf_file)
+                selected.append((index, pdf, parse_page_selection(selection_str, len(pdf.pages))))
+            except Exception as e:
+                self.finished_signal.emit(False, f"Error processing {self.file_names[index]}: {str(e)}")
+                return False
+        return True
+    
+    def report_progress(self, processed, total):
+        """Emit update_progress only when the percentage changes, at most every PROGRESS_INTERVAL"""
+        progress = int((processed / total) * 100) if total else 100
+        now = time.monotonic()
+        if progress != self.last_progress and now - self.last_emit >= self.PROGRESS_INTERVAL:
+            self.last_progress = progress
+            self.last_emit = now
+            self.update_progress.emit(progress)
 
 
 class PDFMergerApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.pdf_files = []
+        self._pdf_set = set()  # Same paths as pdf_files, for O(1) duplicate checks
+        self._basenames = []  # os.path.basename of each entry in pdf_files, same order
         self.drag_enabled = False
+        self.reader_cache = {}  # path -> (mtime, size, PdfReader), see get_cached_reader
         self.init_ui()
         
     def init_ui(self):
@@ -445,10 +927,16 @@ class PDFMergerApp(QMainWindow):
         )
         
         if files:
+            new_files = []
             for file in files:
-                if file not in self.pdf_files:
-                    self.pdf_files.append(file)
-                    self.file_list.addItem(os.path.basename(file))
+                if file not in self._pdf_set:
+                    self._pdf_set.add(file)
+                    new_files.append(file)
+            
+            new_names = [os.path.basename(f) for f in new_files]
+            self.pdf_files.extend(new_files)
+            self._basenames.extend(new_names)
+            self.file_list.addItems(new_names)
             
             self.update_ui_state()
             self.status_label.setText(f"{len(self.pdf_files)} PDFs selected")
@@ -459,7 +947,10 @@ class PDFMergerApp(QMainWindow):
         # Remove from bottom to top to avoid index changes
         for row in sorted(selected_rows, reverse=True):
             self.file_list.takeItem(row)
-            self.pdf_files.pop(row)
+            path = self.pdf_files.pop(row)
+            del self._basenames[row]
+            self._pdf_set.discard(path)
+            self.reader_cache.pop(path, None)
         
         self.update_ui_state()
         self.status_label.setText(f"{len(self.pdf_files)} PDFs selected")
@@ -467,6 +958,9 @@ class PDFMergerApp(QMainWindow):
     def clear_files(self):
         self.file_list.clear()
         self.pdf_files.clear()
+        self._pdf_set.clear()
+        self._basenames.clear()
+        self.reader_cache.clear()
         self.update_ui_state()
         self.status_label.setText("Ready")
     
@@ -476,6 +970,7 @@ class PDFMergerApp(QMainWindow):
             # Swap items in both the list widget and the files list
             self.file_list.insertItem(current_row - 1, self.file_list.takeItem(current_row))
             self.pdf_files[current_row], self.pdf_files[current_row - 1] = self.pdf_files[current_row - 1], self.pdf_files[current_row]
+            self._basenames[current_row], self._basenames[current_row - 1] = self._basenames[current_row - 1], self._basenames[current_row]
             self.file_list.setCurrentRow(current_row - 1)
     
     def move_file_down(self):
@@ -484,6 +979,7 @@ class PDFMergerApp(QMainWindow):
             # Swap items in both the list widget and the files list
             self.file_list.insertItem(current_row + 1, self.file_list.takeItem(current_row))
             self.pdf_files[current_row], self.pdf_files[current_row + 1] = self.pdf_files[current_row + 1], self.pdf_files[current_row]
+            self._basenames[current_row], self._basenames[current_row + 1] = self._basenames[current_row + 1], self._basenames[current_row]
             self.file_list.setCurrentRow(current_row + 1)
     
     def sort_alphabetically(self):
@@ -492,52 +988,51 @@ class PDFMergerApp(QMainWindow):
             return
             
         # Create pairs of (filename, filepath)
-        file_pairs = [(os.path.basename(path), path) for path in self.pdf_files]
+        file_pairs = list(zip(self._basenames, self.pdf_files))
         
         # Sort by filename
         file_pairs.sort(key=lambda x: x[0].lower())
         
         # Update lists with a new list
         self.pdf_files = [pair[1] for pair in file_pairs]
+        self._basenames = [pair[0] for pair in file_pairs]
         
         # Clear and repopulate the list widget
         self.refresh_file_list()
         
         # Update status
         self.status_label.setText("Files sorted alphabetically")
-        print(f"Sorted files alphabetically. New order: {[os.path.basename(f) for f in self.pdf_files]}")
+        print(f"Sorted files alphabetically. New order: {self._basenames}")
     
     def sort_numerically(self):
         """Sort PDF files numerically based on numbers in filenames"""
         if not self.pdf_files:
             return
-            
-        import re
         
         def extract_number(filename):
-            # Extract numbers from filename for numerical sorting
-            numbers = re.findall(r'\d+', filename)
-            return int(numbers[0]) if numbers else 0
+            # Extract the first number from filename for numerical sorting
+            match = _LEADING_NUM_RE.search(filename)
+            return int(match.group()) if match else 0
             
         # Create pairs of (filename, filepath)
-        file_pairs = [(os.path.basename(path), path) for path in self.pdf_files]
+        file_pairs = list(zip(self._basenames, self.pdf_files))
         
         # Try to sort numerically by the first number in each filename
         try:
             file_pairs.sort(key=lambda x: extract_number(x[0]))
             
             # Store the old order for debugging
-            old_order = [os.path.basename(f) for f in self.pdf_files]
+            old_order = self._basenames
             
             # Create a completely new list
             self.pdf_files = [pair[1] for pair in file_pairs]
+            self._basenames = [pair[0] for pair in file_pairs]
             
             # Clear and repopulate the list widget
             self.refresh_file_list()
             
             # Log the change for debugging
-            new_order = [os.path.basename(f) for f in self.pdf_files]
-            print(f"Numeric sort: Changed order from {old_order} to {new_order}")
+            print(f"Numeric sort: Changed order from {old_order} to {self._basenames}")
             
             self.status_label.setText("Files sorted numerically")
         except Exception as e:
@@ -546,18 +1041,19 @@ class PDFMergerApp(QMainWindow):
     
     def refresh_file_list(self):
         """Refresh the file list widget to match the current pdf_files list"""
-        # Temporarily block signals to prevent unnecessary updates
+        # Temporarily block signals and repaints to prevent unnecessary updates
+        self.file_list.setUpdatesEnabled(False)
         self.file_list.blockSignals(True)
         
         # Clear the list
         self.file_list.clear()
         
-        # Add all items in the current order
-        for file_path in self.pdf_files:
-            self.file_list.addItem(os.path.basename(file_path))
+        # Add all items in the current order in a single call
+        self.file_list.addItems(self._basenames)
         
-        # Re-enable signals
+        # Re-enable signals and repaints
         self.file_list.blockSignals(False)
+        self.file_list.setUpdatesEnabled(True)
     
     def toggle_drag_drop(self, enabled):
         """Toggle drag and drop functionality for manual ordering"""
@@ -569,7 +1065,7 @@ class PDFMergerApp(QMainWindow):
             self.status_label.setText("Drag and drop mode enabled. Drag files to reorder.")
             
             # Connect the model's row moved signal to update the files list
-            self.file_list.model().rowsMoved.connect(self.update_pdf_files_from_list)
+            self.file_list.model().rowsMoved.connect(self._on_rows_moved)
             
             # Disable other ordering buttons
             self.move_up_button.setEnabled(False)
@@ -583,13 +1079,10 @@ class PDFMergerApp(QMainWindow):
             
             # Disconnect the signal to prevent unnecessary updates
             try:
-                self.file_list.model().rowsMoved.disconnect(self.update_pdf_files_from_list)
+                self.file_list.model().rowsMoved.disconnect(self._on_rows_moved)
             except:
                 pass
             
-            # Make sure to update the PDF files list one last time
-            self.update_pdf_files_from_list()
-            
             # Re-enable other ordering buttons
             has_files = len(self.pdf_files) > 0
             has_selection = len(self.file_list.selectedItems()) > 0
@@ -599,32 +1092,26 @@ class PDFMergerApp(QMainWindow):
             self.sort_alpha_button.setEnabled(has_files)
             self.sort_num_button.setEnabled(has_files)
     
-    def update_pdf_files_from_list(self):
-        """Update the pdf_files list to match the current order in the list widget"""
-        # Create a mapping from filenames to full paths
-        filename_to_path = {os.path.basename(path): path for path in self.pdf_files}
-        
-        # Create new ordered list based on current list widget order
-        new_order = []
-        for i in range(self.file_list.count()):
-            filename = self.file_list.item(i).text()
-            if filename in filename_to_path:
-                new_order.append(filename_to_path[filename])
+    def _on_rows_moved(self, _parent, start, end, _destination, row):
+        """Apply a drag-and-drop move of rows start..end to before row to pdf_files"""
+        if self.file_list.count() != len(self.pdf_files):
+            # Out of sync; show pdf_files again rather than guess from names
+            self.refresh_file_list()
+            return
         
-        # Update pdf_files list
-        if len(new_order) == len(self.pdf_files):
-            self.pdf_files = new_order.copy()  # Make a copy to ensure a new list is created
-            self.status_label.setText("File order updated")
+        # row is the insertion point before the rows were taken out
+        insert_at = row if row < start else row - (end - start + 1)
+        for files in (self.pdf_files, self._basenames):
+            moved = files[start:end + 1]
+            del files[start:end + 1]
+            files[insert_at:insert_at] = moved
+        self.status_label.setText("File order updated")
     
     def merge_pdfs(self):
         if not self.pdf_files:
             QMessageBox.warning(self, "Warning", "No PDF files selected.")
             return
         
-        # If in drag-drop mode, make sure to update the file order first
-        if self.drag_enabled:
-            self.update_pdf_files_from_list()
-        
         # Open the page selection dialog
         page_dialog = PdfPageSelectionDialog(self.pdf_files, self)
         if page_dialog.exec_() != QDialog.Accepted:
@@ -633,10 +1120,11 @@ class PDFMergerApp(QMainWindow):
         # Get the page selections
         page_selections = page_dialog.get_selections()
         
-        # Show the current order for confirmation
+        # Show the current order for confirmation; selections are shown as
+        # typed, so no PDF has to be opened to build the message
         file_order = "\n".join([
-            f"{i+1}. {os.path.basename(path)} - Pages: {page_selections.get(path, '-1')}" 
-            for i, path in enumerate(self.pdf_files)
+            f"{i+1}. {name} - Pages: {page_selections.get(path, '-1')}" 
+            for i, (name, path) in enumerate(zip(self._basenames, self.pdf_files))
         ])
         
         confirm = QMessageBox.question(
@@ -669,10 +1157,12 @@ class PDFMergerApp(QMainWindow):
         self.status_label.setText("Merging PDFs...")
         
         # Start merge thread
+        # The thread copies the list itself
         self.merge_thread = PdfMergerThread(
-            self.pdf_files.copy(), 
+            self.pdf_files, 
             output_file,
-            page_selections
+            page_selections,
+            reader_cache=self.reader_cache
         )
         self.merge_thread.update_progress.connect(self.progress_bar.setValue)
         self.merge_thread.finished_signal.connect(self.merge_completed)
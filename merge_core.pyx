@@ -0,0 +1,197 @@
+# cython: language_level=3
+"""
+Compiled page selection parser for merge.py
+
+Build in place with:
+    python setup.py build_ext --inplace
+
+merge.py imports parse_page_selection from here when the extension is built
+and falls back to its own pure-Python version otherwise. Both must accept the
+same syntax and return the same results.
+"""
+from libc.stdlib cimport calloc, free
+from libc.string cimport memset
+from libc.limits cimport INT_MAX
+from cpython.list cimport PyList_New, PyList_SET_ITEM
+from cpython.ref cimport Py_INCREF
+
+
+cdef inline bint _is_space(char c):
+    # ASCII characters str.strip() removes
+    return c == 32 or 9 <= c <= 13 or 28 <= c <= 31
+
+
+cdef inline bint _is_int_space(char c):
+    # ASCII characters int() ignores around a number (not \x1c-\x1f)
+    return c == 32 or 9 <= c <= 13
+
+
+cdef bint _parse_int(const char* buf, Py_ssize_t start, Py_ssize_t stop, long long* out):
+    """Parse buf[start:stop] the way int() would, returning False if invalid"""
+    cdef long long value = 0
+    cdef bint negative = False
+    cdef Py_ssize_t digits_start
+
+    while start < stop and _is_int_space(buf[start]):
+        start += 1
+    while stop > start and _is_int_space(buf[stop - 1]):
+        stop -= 1
+
+    # Optional sign ('+' or '-')
+    if start < stop and (buf[start] == 43 or buf[start] == 45):
+        negative = buf[start] == 45
+        start += 1
+
+    if start == stop:
+        return False
+
+    digits_start = start
+    while start < stop:
+        # Like int(), allow single underscores between digits ('1_000')
+        if buf[start] == 95 and start > digits_start and start + 1 < stop:
+            start += 1
+        if not 48 <= buf[start] <= 57:
+            return False
+        # Saturate instead of overflowing; results are clamped to the page count anyway
+        if value < INT_MAX:
+            value = value * 10 + (buf[start] - 48)
+        start += 1
+
+    out[0] = -value if negative else value
+    return True
+
+
+def _to_ascii(str text):
+    return ''.join(
+        c if c.isascii() else str(int(c)) if c.isdecimal() else ' ' if c.isspace() else c
+        for c in text
+    )
+
+
+cpdef list parse_page_selection(str selection_str, int total_pages):
+    """
+    Parse a page selection string and return a list of page indices (0-based)
+
+    Format:
+    - Blank or 'all': All pages
+    - '1,3,5-7': Include pages 1, 3, and 5 through 7
+    - '-1,-3': Exclude pages 1 and 3
+    - '-1-3': Exclude pages 1 through 3
+    """
+    # If empty or "all", include all pages
+    if not selection_str or selection_str.lower() == "all":
+        return list(range(total_pages))
+
+    if total_pages <= 0:
+        return []
+
+    # int() and str.strip() also accept Unicode digits and whitespace; map
+    # them to ASCII so the byte scan below sees the same tokens
+    if not selection_str.isascii():
+        selection_str = _to_ascii(selection_str)
+
+    cdef bytes encoded = selection_str.encode('ascii', 'replace')
+    cdef const char* buf = encoded
+    cdef Py_ssize_t length = len(encoded)
+    cdef Py_ssize_t pos = 0, part_start, part_end, dash, page_idx, n, k
+    cdef long long start_idx, end_idx, value
+    cdef bint is_exclude
+    cdef bint has_include = False
+    cdef char* target
+    cdef list out
+    cdef object item
+
+    # One byte per page instead of Python sets of ints
+    cdef char* included = <char*>calloc(total_pages, 1)
+    cdef char* excluded = <char*>calloc(total_pages, 1)
+
+    try:
+        if included == NULL or excluded == NULL:
+            raise MemoryError()
+
+        # Scan each comma-separated part
+        while pos <= length:
+            part_start = pos
+            part_end = pos
+            while part_end < length and buf[part_end] != 44:  # ','
+                part_end += 1
+            pos = part_end + 1
+
+            while part_start < part_end and _is_space(buf[part_start]):
+                part_start += 1
+            while part_end > part_start and _is_space(buf[part_end - 1]):
+                part_end -= 1
+            if part_start == part_end:
+                continue
+
+            # Check if it's an exclusion
+            is_exclude = buf[part_start] == 45  # '-'
+            if is_exclude:
+                part_start += 1
+
+            # Check if it's a range (contains a hyphen)
+            dash = part_start
+            while dash < part_end and buf[dash] != 45:
+                dash += 1
+
+            if dash < part_end:
+                # Convert to 0-based indices; an empty side means open-ended
+                if dash == part_start:
+                    start_idx = 0
+                elif _parse_int(buf, part_start, dash, &value):
+                    start_idx = value - 1
+                else:
+                    continue
+
+                if dash + 1 == part_end:
+                    end_idx = total_pages - 1
+                elif _parse_int(buf, dash + 1, part_end, &value):
+                    end_idx = value - 1
+                else:
+                    continue
+
+                # Ensure valid page range
+                if start_idx < 0:
+                    start_idx = 0
+                if end_idx > total_pages - 1:
+                    end_idx = total_pages - 1
+                if start_idx > end_idx:
+                    continue
+
+                target = excluded if is_exclude else included
+                memset(target + start_idx, 1, <size_t>(end_idx - start_idx + 1))
+                if not is_exclude:
+                    has_include = True
+            else:
+                # Single page
+                if not _parse_int(buf, part_start, part_end, &value):
+                    continue
+
+                if 0 < value <= total_pages:
+                    if is_exclude:
+                        excluded[value - 1] = 1
+                    else:
+                        included[value - 1] = 1
+                        has_include = True
+
+        # Without specific includes, start with all pages
+        if not has_include:
+            memset(included, 1, <size_t>total_pages)
+
+        n = 0
+        for page_idx in range(total_pages):
+            if included[page_idx] and not excluded[page_idx]:
+                n += 1
+
+        out = PyList_New(n)
+        k = 0
+        for page_idx in range(total_pages):
+            if included[page_idx] and not excluded[page_idx]:
+                item = page_idx
+                Py_INCREF(item)
+                PyList_SET_ITEM(out, k, item)
+                k += 1
+        return out
+    finally:
+        free(included)
+        free(excluded)
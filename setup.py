@@ -0,0 +1,10 @@
+from setuptools import setup
+from Cython.Build import cythonize
+
+# Builds the optional compiled page selection parser used by merge.py:
+#   pip install Cython
+#   python setup.py build_ext --inplace
+setup(
+    name="pdf-maestro",
+    ext_modules=cythonize("merge_core.pyx", language_level=3),
+)